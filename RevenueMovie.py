@@ -1,33 +1,13 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import uuid
 
-class PopularityRecommender:
-    def __init__(self, movies_file):
-        # Load dataset
-        self.movies = pd.read_csv(movies_file)
-
-        # Check required columns
-        if "title" not in self.movies.columns or "popularity" not in self.movies.columns:
-            raise ValueError("CSV must contain 'title' and 'popularity' columns.")
-
-        # Clean dataset
-        self.movies = self.movies[['title', 'popularity']].dropna()
-        self.movies = self.movies[self.movies['popularity'] > 0].reset_index(drop=True)
-
-    def recommend_by_popularity(self, popularity, locked_range=None):
-        """Recommend movies within ±15% popularity range"""
-        if not locked_range:
-            lower = popularity * 0.85
-            upper = popularity * 1.15
-        else:
-            lower, upper = locked_range
-
-        candidates = self.movies[
-            (self.movies['popularity'] >= lower) & (self.movies['popularity'] <= upper)
-        ]
-        return candidates[['title', 'popularity']], (lower, upper)
+from module.feedback import CLEARED, DISLIKE, LIKE, FeedbackStore
+from module.pagination import PagedResult, page_picker
+from module.warmup import get_popularity_warmup
 
+PAGE_SIZE = 20
 
 # ---------------- STREAMLIT APP ----------------
 st.markdown(
@@ -49,8 +29,25 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# Initialize recommender
-recommender = PopularityRecommender("dataset/RevenueMovies.csv")
+# Initialize recommender (catalog and title index are built once per host, then
+# memory-mapped by every server process and hot-swapped when the CSV changes)
+popularity = get_popularity_warmup()
+recommender = popularity.get("popularity")
+if recommender is None:
+    with st.spinner("Loading the movie catalog…"):
+        recommender = popularity.wait("popularity")
+    if recommender is None:
+        st.error(f"Failed to load the movie catalog ({popularity.error}).")
+        st.stop()
+
+
+# One feedback store per server; writes are batched on its background thread
+@st.cache_resource
+def load_feedback_store(db_file):
+    return FeedbackStore(db_file)
+
+
+feedback_store = load_feedback_store("dataset/feedback.sqlite")
 
 # Session state
 if "locked_range" not in st.session_state:
@@ -67,45 +64,59 @@ if "disliked_recommended" not in st.session_state:
     st.session_state["disliked_recommended"] = []  # explicit dislikes
 if "user_preferences" not in st.session_state:
     st.session_state["user_preferences"] = []
+if "session_id" not in st.session_state:
+    st.session_state["session_id"] = uuid.uuid4().hex
+if "recorded_feedback" not in st.session_state:
+    st.session_state["recorded_feedback"] = {}  # title -> verdict already sent to the store
 
 
-# Callback helpers to enforce mutual exclusivity
-def _on_like_change(title):
-    # If like was checked, force dislike to False
-    like_key = f"like_{title}"
-    dislike_key = f"dislike_{title}"
-    if st.session_state.get(like_key, False):
-        st.session_state[dislike_key] = False
+if "movie_editor_version" not in st.session_state:
+    st.session_state["movie_editor_version"] = 0
+if "rec_editor_version" not in st.session_state:
+    st.session_state["rec_editor_version"] = 0
 
 
-def _on_dislike_change(title):
-    dislike_key = f"dislike_{title}"
-    like_key = f"like_{title}"
-    if st.session_state.get(dislike_key, False):
-        st.session_state[like_key] = False
+# Editors are keyed by a version so a fresh table is rendered from session state
+# whenever it changes; the rerun makes the new table visible before the next click
+def _commit_editor(version_key):
+    st.session_state[version_key] += 1
+    st.rerun()
 
 
 # ================== Movie Selection ==================
 st.subheader("🎥 Select Movies You Watched (Max 10)")
 
+# Type-ahead search over the whole catalog; falls back to the random sample when empty
+search_query = st.text_input("🔍 Search movie titles", key="title_search")
+candidates_df = recommender.search_titles(search_query, limit=200) if search_query else st.session_state["sample_movies"]
+if search_query and candidates_df.empty:
+    st.caption("No titles start with that text.")
+
 # Keep previously selected movies always visible
 selected_df = recommender.movies[recommender.movies['title'].isin(st.session_state["selected_movies"])]
-remaining_df = st.session_state["sample_movies"][~st.session_state["sample_movies"]['title'].isin(st.session_state["selected_movies"])]
+remaining_df = candidates_df[~candidates_df['title'].isin(st.session_state["selected_movies"])]
 all_movies_to_show = pd.concat([selected_df, remaining_df]).drop_duplicates().reset_index(drop=True)
 
-new_selected_movies = []
-for _, row in all_movies_to_show.iterrows():
-    col1, col2 = st.columns([3, 1])
-    with col1:
-        st.write(f"**{row['title']}** (Popularity: {row['popularity']:.2f})")
-    with col2:
-        key = f"movie_{row['title']}"
-        # Ensure key exists so checkbox preserves state across reruns
-        if key not in st.session_state:
-            st.session_state[key] = (row['title'] in st.session_state["selected_movies"])
-        checked = st.checkbox("Select", key=key)
-        if checked:
-            new_selected_movies.append(row['title'])
+candidates = PagedResult(all_movies_to_show)
+page = page_picker(candidates, "movie_list", PAGE_SIZE)
+page_df = candidates.page(page=page, page_size=PAGE_SIZE)
+
+# One batched table per page instead of a row of widgets per movie
+edited = st.data_editor(
+    page_df[['title', 'popularity']].assign(Select=page_df['title'].isin(st.session_state["selected_movies"])),
+    key=f"movie_editor_{st.session_state['movie_editor_version']}_{page}_{search_query}",
+    hide_index=True,
+    disabled=['title', 'popularity'],
+    column_config={
+        "title": "Title",
+        "popularity": st.column_config.NumberColumn("Popularity", format="%.2f"),
+    },
+)
+# Keep the existing selection order so an unchanged table never looks like an edit
+checked = set(edited.loc[edited['Select'], 'title'])
+page_titles = set(page_df['title'])
+new_selected_movies = [t for t in st.session_state["selected_movies"] if t not in page_titles or t in checked]
+new_selected_movies += [t for t in edited.loc[edited['Select'], 'title'] if t not in new_selected_movies]
 
 # cap at 10
 if len(new_selected_movies) > 10:
@@ -113,7 +124,9 @@ if len(new_selected_movies) > 10:
     new_selected_movies = new_selected_movies[:10]
 
 # Update session state with current checked movies (unchecking removes it from calculations)
-st.session_state["selected_movies"] = new_selected_movies
+if new_selected_movies != st.session_state["selected_movies"]:
+    st.session_state["selected_movies"] = new_selected_movies
+    _commit_editor("movie_editor_version")
 
 if st.session_state["selected_movies"]:
     st.info(f"✅ Selected Movies: {', '.join(st.session_state['selected_movies'])}")
@@ -136,6 +149,7 @@ if refresh_list:
         recommender.movies[recommender.movies['title'].isin(st.session_state["selected_movies"])],
         new_sample
     ]).drop_duplicates(subset=['title']).reset_index(drop=True)
+    st.session_state["movie_editor_version"] += 1
 
 
 # ================== Recommendations ==================
@@ -144,50 +158,52 @@ if show_recs:
     st.session_state["locked_range"] = None  # reset lock when generating new recommendations
     for title in st.session_state["selected_movies"]:
         # Guard if title not found (edge case)
-        match = recommender.movies[recommender.movies['title'] == title]
-        if match.empty:
+        row = recommender.find_movie(title)
+        if row is None:
             continue
-        row = match.iloc[0]
         recs, locked = recommender.recommend_by_popularity(row['popularity'], st.session_state["locked_range"])
         st.session_state["locked_range"] = locked
         recs = recs[recs['title'] != title]
         all_recs = pd.concat([all_recs, recs])
 
     if not all_recs.empty:
-        # Remove any items already marked as watched
-        all_recs = all_recs[~all_recs['title'].isin(st.session_state["selected_movies"])]
-        st.session_state["recommendations"] = all_recs.drop_duplicates(subset=['title']).sample(min(10, len(all_recs)))
+        # Remove any items already marked as watched or not interested
+        disliked = [t for t, v in st.session_state["recorded_feedback"].items() if v == DISLIKE]
+        all_recs = all_recs[~all_recs['title'].isin(st.session_state["selected_movies"] + disliked)]
+        all_recs = all_recs.drop_duplicates(subset=['title'])
+        st.session_state["recommendations"] = recommender.rerank(all_recs, feedback_store.title_scores(), n=10)
     else:
         st.session_state["recommendations"] = pd.DataFrame()
+    st.session_state["rec_editor_version"] += 1
 
 
 # Display recommendations
 if not st.session_state["recommendations"].empty:
     st.subheader("🎯 Interested in any of the movies below? Tick to mark as interested, or mark as not interested. Refresh if not interested in any.")
 
-    # Render like / dislike checkboxes with mutual exclusivity enforced via callbacks
-    for _, row in st.session_state["recommendations"].reset_index(drop=True).iterrows():
-        title = row['title']
-        col1, col2, col3 = st.columns([4, 1.2, 1.8])
-        with col1:
-            st.write(f"**{title}** (Popularity: {row['popularity']:.2f})")
-        like_key = f"like_{title}"
-        dislike_key = f"dislike_{title}"
-
-        # Initialize keys if they don't exist
-        if like_key not in st.session_state:
-            st.session_state[like_key] = (title in st.session_state["selected_recommended"])
-        if dislike_key not in st.session_state:
-            st.session_state[dislike_key] = (title in st.session_state["disliked_recommended"])
-
-        with col2:
-            st.checkbox("Like", key=like_key, on_change=_on_like_change, args=(title,))
-        with col3:
-            st.checkbox("Not interested", key=dislike_key, on_change=_on_dislike_change, args=(title,))
-
-    # After rendering, collect selections
-    like_titles = [t for t in st.session_state["recommendations"]["title"].tolist() if st.session_state.get(f"like_{t}", False)]
-    dislike_titles = [t for t in st.session_state["recommendations"]["title"].tolist() if st.session_state.get(f"dislike_{t}", False)]
+    # Render like / dislike columns in one batched table
+    recs = st.session_state["recommendations"].reset_index(drop=True)
+    prev_likes = set(st.session_state["selected_recommended"])
+    prev_dislikes = set(st.session_state["disliked_recommended"])
+    edited = st.data_editor(
+        recs[['title', 'popularity']].assign(
+            Like=recs['title'].isin(prev_likes),
+            **{"Not interested": recs['title'].isin(prev_dislikes)},
+        ),
+        key=f"rec_editor_{st.session_state['rec_editor_version']}",
+        hide_index=True,
+        disabled=['title', 'popularity'],
+        column_config={
+            "title": "Title",
+            "popularity": st.column_config.NumberColumn("Popularity", format="%.2f"),
+        },
+    )
+
+    # Enforce mutual exclusivity: the box that was just ticked wins
+    both = edited['Like'] & edited['Not interested']
+    newly_liked = ~edited['title'].isin(prev_likes)
+    like_titles = edited.loc[edited['Like'] & ~(both & ~newly_liked), 'title'].tolist()
+    dislike_titles = edited.loc[edited['Not interested'] & ~(both & newly_liked), 'title'].tolist()
 
     # Optional cap on positive selections
     if len(like_titles) > 5:
@@ -195,24 +211,38 @@ if not st.session_state["recommendations"].empty:
         like_titles = like_titles[:5]
 
     # Persist selections across reruns
-    st.session_state["selected_recommended"] = like_titles
-    st.session_state["disliked_recommended"] = dislike_titles
+    if like_titles != st.session_state["selected_recommended"] or dislike_titles != st.session_state["disliked_recommended"]:
+        st.session_state["selected_recommended"] = like_titles
+        st.session_state["disliked_recommended"] = dislike_titles
+        if both.any():
+            _commit_editor("rec_editor_version")
 
     if st.session_state["selected_recommended"]:
         st.success(f"✨ Liked: {', '.join(st.session_state['selected_recommended'])}")
     if st.session_state["disliked_recommended"]:
         st.info(f"🙅 Not interested: {', '.join(st.session_state['disliked_recommended'])}")
 
-    # Capture user preferences for future reference (only likes)
+    # Send only changed verdicts to the durable store (no repeats on reruns)
+    recorded = st.session_state["recorded_feedback"]
+    for title in recs['title']:
+        verdict = LIKE if title in like_titles else DISLIKE if title in dislike_titles else CLEARED
+        if recorded.get(title, CLEARED) != verdict:
+            feedback_store.record(st.session_state["session_id"], title, verdict)
+            recorded[title] = verdict
+
+    # Capture user preferences for future reference (only likes, one record per title)
     if st.session_state["selected_recommended"]:
         chosen = st.session_state["recommendations"][
             st.session_state["recommendations"]["title"].isin(st.session_state["selected_recommended"])
         ]
-        st.session_state["user_preferences"].extend(chosen.to_dict('records'))
+        preferences = {p['title']: p for p in st.session_state["user_preferences"]}
+        preferences.update((p['title'], p) for p in chosen.to_dict('records'))
+        st.session_state["user_preferences"] = list(preferences.values())
 
     # Refresh recommendations button (keep selections)
     if st.button("🔄 Refresh Recommendations"):
         st.session_state["recommendations"] = st.session_state["recommendations"].sample(frac=1).reset_index(drop=True)
+        _commit_editor("rec_editor_version")
 
     # ================== Precision (Feedback-based) ==================
     # We compute precision using only items the user explicitly evaluated (liked or not interested)
@@ -229,3 +259,7 @@ if not st.session_state["recommendations"].empty:
             )
     else:
         st.info("Mark some recommendations as Like or Not interested to see precision.")
+
+    overall = feedback_store.precision()
+    if overall is not None:
+        st.metric("Precision (all users)", f"{overall:.2f}")
@@ -1,41 +1,55 @@
 import streamlit as st
-import pandas as pd
 
 # Import team members' modules (classes)
 # from module.popular import PopularRecommender
 # from module.rating import RatingRecommender
 # from module.genre import GenreRecommender
+from module.warmup import get_snapshots, get_warmup, show_progress
 
-# Load MovieLens data
-movies = pd.read_csv("dataset/movies.csv")
-ratings = pd.read_csv("dataset/ratings.csv")
+# MovieLens data is loaded once per server in the background; every view below is a
+# weight preset of the shared ranker (the saved top list answers until it is ready)
+warmup = get_warmup()
+ranker = warmup.get("ranker")
+if ranker is None and warmup.fallback is None:
+    with st.spinner("Loading movie data for the first time…"):
+        ranker = warmup.wait("ranker")
+    if ranker is None:
+        st.error(f"Failed to build the recommender data ({warmup.error}).")
+        st.stop()
+
+def top_movies(preset, sort_column, genre=None):
+    """Top 5 for a ranker preset, or from the saved top list while the ranker warms up"""
+    if ranker is not None:
+        mask = None if genre is None else ranker.table['genres'].str.contains(genre, case=False, na=False).to_numpy()
+        return ranker.rank(preset, k=5, mask=mask, min_votes=1)
+    table = warmup.fallback
+    if genre is not None:
+        table = table[table['genres'].str.contains(genre, case=False, na=False)]
+    return table.sort_values(sort_column, ascending=False).head(5)
 
 st.title("🎬 Movie Recommender System")
+show_progress(warmup)
 
 option = st.selectbox("Choose a Recommendation Type", ["Top 5 Most-Selling Movies", "Top 5 Highest-Rated Movies", "Top 5 Movies by Genre"])
 
 if option == "Top 5 Most-Selling Movies":
     # Count how many ratings each movie has = popularity
-    sales = ratings['movieId'].value_counts().reset_index()
-    sales.columns = ['movieId', 'sales_count']
-    top_sales = sales.merge(movies, on='movieId')
+    top_sales = top_movies("most_rated", 'v').rename(columns={'v': 'sales_count'})
     st.subheader("Top 5 Most-Selling Movies")
-    st.dataframe(top_sales[['title', 'sales_count']].head(5))
+    st.dataframe(top_sales[['title', 'sales_count']])
 
 elif option == "Top 5 Highest-Rated Movies":
-    avg_rating = ratings.groupby('movieId')['rating'].mean().reset_index()
-    avg_rating.columns = ['movieId', 'avg_rating']
-    top_rated = avg_rating.merge(movies, on='movieId')
-    top_rated = top_rated.sort_values(by='avg_rating', ascending=False)
+    top_rated = top_movies("highest_mean", 'avg').rename(columns={'avg': 'avg_rating'})
     st.subheader("Top 5 Highest-Rated Movies")
-    st.dataframe(top_rated[['title', 'avg_rating']].head(5))
+    st.dataframe(top_rated[['title', 'avg_rating']])
 
 elif option == "Top 5 Movies by Genre":
     genre = st.text_input("Enter a genre (e.g., Action, Comedy, Drama):")
     if genre:
-        genre_movies = movies[movies['genres'].str.contains(genre, case=False, na=False)]
-        avg_rating = ratings.groupby('movieId')['rating'].mean().reset_index()
-        genre_rated = genre_movies.merge(avg_rating, on='movieId')
-        genre_rated = genre_rated.sort_values(by='rating', ascending=False)
+        genre_rated = top_movies("highest_mean", 'avg', genre).rename(columns={'avg': 'rating'})
         st.subheader(f"Top 5 {genre} Movies")
-        st.dataframe(genre_rated[['title', 'genres', 'rating']].head(5))
+        st.dataframe(genre_rated[['title', 'genres', 'rating']])
+
+with st.expander("🗂 Data versions"):
+    # A new version builds in the background when the CSVs change; the live one keeps serving
+    st.dataframe(get_snapshots().report(), hide_index=True)
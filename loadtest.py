@@ -0,0 +1,188 @@
+# loadtest.py
+# Headless load test for the Streamlit pages using Streamlit's AppTest.
+#
+#   python loadtest.py --sessions 20 --iterations 5
+#   python loadtest.py --pages ratingMovie.py --sessions 50 --workers 4
+#
+# Every simulated session is its own AppTest (own session state). AppTest swaps
+# a global Runtime per rerun, so it cannot run in parallel threads; instead each
+# worker process plays one server process and interleaves its sessions
+# round-robin, sharing st.cache_data / st.cache_resource like real users do.
+import argparse
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+# ------------------ Scripted interactions ------------------
+# Each step mutates the app and returns it un-run; the driver times the rerun.
+def _click(at, text):
+    return next(b for b in at.button if text in b.label).click()
+
+
+def _rating_steps(at, i):
+    yield at.slider[0].set_value(round(0.50 + (i * 0.07) % 0.45, 2))
+    yield at.selectbox[0].select(at.selectbox[0].options[1 + i % (len(at.selectbox[0].options) - 1)])
+    yield at.slider[1].set_value((1990, 2010))
+
+
+def _genre_steps(at, i):
+    yield at.multiselect[0].select(at.multiselect[0].options[i % len(at.multiselect[0].options)])
+    yield _click(at, "Show Recommendations")
+    yield at.selectbox[0].select("Random")
+    if at.number_input:
+        yield at.number_input[0].set_value(min(2, at.number_input[0].max))
+    yield _click(at, "Surprise Me")
+
+
+def _popularity_steps(at, i):
+    yield at.text_input(key="title_search").input("the" if i % 2 == 0 else "")
+    # st.data_editor cannot be driven by AppTest, so pick watched movies via session state
+    at.session_state["selected_movies"] = list(at.session_state["sample_movies"]["title"][:3])
+    yield _click(at, "Show Recommendations")
+    at.session_state["selected_recommended"] = list(at.session_state["recommendations"]["title"][:2])
+    yield at
+    yield _click(at, "Refresh Recommendations")
+    yield _click(at, "Refresh Movie List")
+
+
+SCENARIOS = {
+    "ratingMovie.py": _rating_steps,
+    "moviesGenres.py": _genre_steps,
+    "RevenueMovie.py": _popularity_steps,
+}
+
+
+# ------------------ Measurement ------------------
+def session_state_bytes(at):
+    """Approximate size of one session's state (pickled size of every value)."""
+    total = 0
+    for value in at.session_state.values():
+        try:
+            total += len(pickle.dumps(value))
+        except Exception:
+            total += sys.getsizeof(value)
+    return total
+
+
+def _scenario(page, at, iterations):
+    for i in range(iterations):
+        yield from SCENARIOS[page](at, i)
+
+
+def run_worker(page, sessions, iterations, timeout):
+    """Drive `sessions` interleaved sessions of one page; time the cold first run and each successful rerun."""
+    os.chdir(ROOT)
+    live, results = [], []
+    for _ in range(sessions):
+        at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=timeout)
+        live.append({"at": at, "steps": _scenario(page, at, iterations), "latencies": []})
+
+    # Round-robin: one rerun per live session per pass, like users clicking in turn
+    while live:
+        for session in list(live):
+            at = session["at"]
+            try:
+                step = at if "first_bytes" not in session else next(session["steps"], None)
+                if step is None:
+                    session["growth"] = session_state_bytes(at) - session["first_bytes"]
+                else:
+                    start = time.perf_counter()
+                    step.run()
+                    elapsed = time.perf_counter() - start
+                    # Errored runs are not measurements: the session stops here
+                    if at.exception:
+                        raise RuntimeError(at.exception[0].message)
+                    if "first_bytes" in session:
+                        session["latencies"].append(elapsed)
+                    else:
+                        # First run is a cold start (engine build / warm-up wait), kept apart
+                        session["cold"] = elapsed
+                        session["first_bytes"] = session_state_bytes(at)
+                    continue
+            except Exception as exc:
+                session["error"] = f"{type(exc).__name__}: {exc}"
+            live.remove(session)
+            results.append({
+                "cold": session.get("cold"),
+                "latencies": session["latencies"],
+                "growth": session.get("growth"),
+                "error": session.get("error"),
+            })
+    return results
+
+
+def run_load_test(page, sessions=10, iterations=3, workers=1, timeout=120):
+    """Run `sessions` concurrent sessions of one page and summarize the reruns."""
+    workers = max(1, min(workers, sessions))
+    shares = [sessions // workers + (w < sessions % workers) for w in range(workers)]
+    wall_start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_worker, page, share, iterations, timeout) for share in shares]
+        results = [r for f in futures for r in f.result()]
+    wall = time.perf_counter() - wall_start
+
+    latencies = np.array([t for r in results for t in r["latencies"]]) * 1000
+    cold = np.array([r["cold"] for r in results if r["cold"] is not None]) * 1000
+    growth = [r["growth"] for r in results if r["growth"] is not None]
+    errors = [r["error"] for r in results if r["error"]]
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (np.nan,) * 3
+    return {
+        "page": page,
+        "sessions": sessions,
+        "workers": workers,
+        "reruns": len(latencies),
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "p99_ms": p99,
+        "cold_runs": len(cold),
+        "cold_p50_ms": np.percentile(cold, 50) if len(cold) else np.nan,
+        "cold_max_ms": cold.max() if len(cold) else np.nan,
+        "reruns_per_s": len(latencies) / wall,
+        "state_growth_kb_mean": np.mean(growth) / 1024 if growth else np.nan,
+        "state_growth_kb_max": np.max(growth) / 1024 if growth else np.nan,
+        "errors": errors,
+    }
+
+
+def print_report(report):
+    print(f"\n== {report['page']}  ({report['sessions']} sessions on {report['workers']} workers, {report['reruns']} reruns)")
+    if report["cold_runs"]:
+        print(f"   cold first run p50 {report['cold_p50_ms']:.0f} ms | max {report['cold_max_ms']:.0f} ms ({report['cold_runs']} sessions)")
+    else:
+        print("   cold first run none succeeded")
+    if report["reruns"]:
+        print(f"   rerun latency  p50 {report['p50_ms']:.0f} ms | p95 {report['p95_ms']:.0f} ms | p99 {report['p99_ms']:.0f} ms")
+    else:
+        print("   rerun latency  no successful reruns")
+    print(f"   throughput     {report['reruns_per_s']:.1f} reruns/s")
+    if not np.isnan(report["state_growth_kb_mean"]):
+        print(f"   session state  +{report['state_growth_kb_mean']:.1f} KB mean | +{report['state_growth_kb_max']:.1f} KB max")
+    if report["errors"]:
+        print(f"   errors         {len(report['errors'])} sessions failed, e.g. {report['errors'][0]}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the Streamlit pages")
+    parser.add_argument("--pages", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent sessions per page")
+    parser.add_argument("--iterations", type=int, default=3, help="scenario repetitions per session")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="server processes to simulate")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per rerun")
+    args = parser.parse_args(argv)
+
+    # Pages read dataset/ with relative paths
+    os.chdir(ROOT)
+    for page in args.pages:
+        print_report(run_load_test(page, args.sessions, args.iterations, args.workers, args.timeout))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Shared recommender engines used by the Streamlit pages
@@ -0,0 +1,162 @@
+import hashlib
+import logging
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+NO_GENRES = "(no genres listed)"
+
+
+def _l2_normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class ContentRecommender:
+    def __init__(self, movies, n_neighbours=20, year_weight=0.5, cache_path=None, block_size=1024):
+        """Content-based engine over genre TF-IDF and release decade.
+
+        Works for movies with few or no ratings. Top-N cosine neighbours of
+        every movie are computed once in blocks and, when cache_path is set,
+        persisted so later loads are a single file read.
+        """
+        self.movie_ids = movies["movieId"].to_numpy()
+        self.row_index = pd.Index(self.movie_ids)
+        self.n_neighbours = n_neighbours
+        self.year_weight = year_weight
+
+        # Genre TF-IDF (each tag appears at most once per movie, so tf is 0/1)
+        tags = movies["genres"].fillna("").str.split("|")
+        self.vocab = sorted({g for gs in tags for g in gs if g and g != NO_GENRES})
+        self.genre_col = {g: j for j, g in enumerate(self.vocab)}
+        tf = np.zeros((len(movies), len(self.vocab)), dtype=np.float32)
+        for i, gs in enumerate(tags):
+            for g in gs:
+                j = self.genre_col.get(g)
+                if j is not None:
+                    tf[i, j] = 1.0
+        n_docs = len(movies)
+        self.idf = (np.log((1 + n_docs) / (1 + tf.sum(axis=0))) + 1).astype(np.float32)
+        self.genre_vectors = _l2_normalize(tf * self.idf)
+
+        # Release decade one-hot, scaled so genres still dominate the similarity
+        if "year" in movies:
+            years = pd.to_numeric(movies["year"], errors="coerce")
+        else:
+            years = pd.to_numeric(movies["title"].str.extract(r"\((\d{4})\)")[0], errors="coerce")
+        decades = (years // 10).to_numpy()
+        known = ~np.isnan(decades)
+        decade_values = np.unique(decades[known]).astype(int)
+        decade_onehot = np.zeros((len(movies), len(decade_values)), dtype=np.float32)
+        decade_onehot[np.flatnonzero(known), np.searchsorted(decade_values, decades[known].astype(int))] = 1.0
+
+        self.vectors = _l2_normalize(np.hstack([self.genre_vectors, year_weight * decade_onehot]))
+
+        # Cache key covers everything the neighbours depend on, so a refresh
+        # that changes genres or years (same movieIds) is a miss
+        h = hashlib.sha1(np.ascontiguousarray(self.vectors).tobytes())
+        h.update(np.ascontiguousarray(self.movie_ids).tobytes())
+        h.update(f"{n_neighbours}:{year_weight}".encode())
+        self.cache_key = h.hexdigest()
+
+        if not self._load_neighbours(cache_path):
+            self.neighbours, self.neighbour_scores = self._compute_neighbours(block_size)
+            if cache_path:
+                self._save_neighbours(cache_path)
+
+    def _load_neighbours(self, cache_path):
+        if not cache_path or not os.path.exists(cache_path):
+            return False
+        try:
+            with np.load(cache_path) as data:
+                # Only reuse a cache built from the same inputs and settings
+                if "key" not in data or str(data["key"]) != self.cache_key:
+                    return False
+                self.neighbours = data["neighbours"]
+                self.neighbour_scores = data["scores"]
+        except Exception:
+            logger.exception("Ignoring unreadable neighbour cache %s", cache_path)
+            return False
+        return True
+
+    def _save_neighbours(self, cache_path):
+        # Write to a temp file and rename, so concurrent readers never see a partial zip
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cache_path) or ".", suffix=".tmp.npz")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, key=self.cache_key, neighbours=self.neighbours, scores=self.neighbour_scores)
+            os.replace(tmp, cache_path)
+        except OSError:
+            logger.exception("Could not write neighbour cache %s", cache_path)
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _compute_neighbours(self, block_size):
+        n = len(self.vectors)
+        k = min(self.n_neighbours, n - 1)
+        neighbours = np.empty((n, max(k, 0)), dtype=np.int32)
+        scores = np.empty((n, max(k, 0)), dtype=np.float32)
+        if k <= 0:
+            return neighbours, scores
+
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+            sims = self.vectors[start:stop] @ self.vectors.T
+            # A movie is never its own neighbour
+            sims[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+            top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(sims, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            neighbours[start:stop] = np.take_along_axis(top, order, axis=1)
+            scores[start:stop] = np.take_along_axis(top_scores, order, axis=1)
+        return neighbours, scores
+
+    def shared_state(self):
+        """Arrays and scalars to publish on the shared data plane."""
+        arrays = {
+            f"content.{name}": getattr(self, name)
+            for name in ("movie_ids", "idf", "genre_vectors", "vectors", "neighbours", "neighbour_scores")
+        }
+        meta = {"vocab": self.vocab, "n_neighbours": self.n_neighbours, "year_weight": self.year_weight}
+        return arrays, meta
+
+    @classmethod
+    def from_shared(cls, arrays, meta):
+        """Attach to published vectors and neighbours (read-only, nothing recomputed)."""
+        self = cls.__new__(cls)
+        for name in ("movie_ids", "idf", "genre_vectors", "vectors", "neighbours", "neighbour_scores"):
+            setattr(self, name, arrays[f"content.{name}"])
+        self.row_index = pd.Index(self.movie_ids)
+        self.vocab = meta["vocab"]
+        self.genre_col = {g: j for j, g in enumerate(self.vocab)}
+        self.n_neighbours, self.year_weight = meta["n_neighbours"], meta["year_weight"]
+        return self
+
+    def rows(self, movie_ids):
+        """Map movieIds to engine rows (-1 for unknown ids)."""
+        return self.row_index.get_indexer(movie_ids)
+
+    def similar(self, movie_id, n=10):
+        """Precomputed nearest movies for one movieId, most similar first."""
+        row = self.row_index.get_loc(movie_id)
+        return pd.DataFrame({
+            "movieId": self.movie_ids[self.neighbours[row, :n]],
+            "similarity": self.neighbour_scores[row, :n],
+        })
+
+    def genre_similarity(self, genres):
+        """Cosine similarity of every movie's genre vector to a genre selection."""
+        query = np.zeros(len(self.vocab), dtype=np.float32)
+        for g in genres:
+            j = self.genre_col.get(g)
+            if j is not None:
+                query[j] = self.idf[j]
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return np.zeros(len(self.movie_ids), dtype=np.float32)
+        return self.genre_vectors @ (query / norm)
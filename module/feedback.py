@@ -0,0 +1,125 @@
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+LIKE, CLEARED, DISLIKE = 1, 0, -1
+
+
+class FeedbackStore:
+    def __init__(self, path, flush_interval=1.0, batch_size=200, refresh_interval=30.0):
+        """Durable like/dislike store shared by every session on the server.
+
+        record() only enqueues; a background thread collects writes for up to
+        flush_interval seconds, keeps the last verdict per (session, title)
+        and commits the batch in one SQLite transaction. The same thread
+        recomputes the aggregates after each batch (and every
+        refresh_interval seconds while idle, to pick up other processes), so
+        reads never touch the database.
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.refresh_interval = refresh_interval
+        self._queue = queue.Queue()
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS feedback ("
+                " session_id TEXT NOT NULL,"
+                " title TEXT NOT NULL,"
+                " verdict INTEGER NOT NULL,"
+                " updated REAL NOT NULL,"
+                " PRIMARY KEY (session_id, title))"
+            )
+            self._refresh(conn)
+
+        self._writer = threading.Thread(target=self._run, name="feedback-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def record(self, session_id, title, verdict):
+        """Queue a LIKE, DISLIKE or CLEARED verdict; returns immediately."""
+        self._queue.put((session_id, title, verdict, time.time()))
+
+    def flush(self):
+        """Block until everything queued so far is committed."""
+        self._queue.join()
+
+    def _run(self):
+        conn = self._connect()
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.refresh_interval)]
+            except queue.Empty:
+                self._try_refresh(conn)
+                continue
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._write(conn, batch)
+            except sqlite3.Error:
+                logger.exception("Dropped %d feedback writes", len(batch))
+            else:
+                self._try_refresh(conn)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, conn, batch):
+        # Deduplicate: only the latest verdict per (session, title) is written
+        latest = {}
+        for session_id, title, verdict, ts in batch:
+            latest[(session_id, title)] = (verdict, ts)
+        upserts = [(s, t, v, ts) for (s, t), (v, ts) in latest.items() if v != CLEARED]
+        deletes = [(s, t) for (s, t), (v, _) in latest.items() if v == CLEARED]
+        with conn:
+            conn.executemany(
+                "INSERT INTO feedback VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (session_id, title) DO UPDATE SET verdict = excluded.verdict, updated = excluded.updated",
+                upserts,
+            )
+            conn.executemany("DELETE FROM feedback WHERE session_id = ? AND title = ?", deletes)
+
+    def _refresh(self, conn):
+        scores = pd.read_sql_query(
+            "SELECT title, SUM(verdict = 1) AS likes, SUM(verdict = -1) AS dislikes"
+            " FROM feedback GROUP BY title",
+            conn,
+            index_col="title",
+        )
+        liked, evaluated = conn.execute("SELECT SUM(verdict = 1), COUNT(*) FROM feedback").fetchone()
+        # One assignment, so readers see both aggregates from the same refresh
+        self._aggregates = (scores, liked / evaluated if evaluated else None)
+
+    def _try_refresh(self, conn):
+        try:
+            self._refresh(conn)
+        except (sqlite3.Error, pd.errors.DatabaseError):
+            logger.exception("Could not refresh feedback aggregates")
+
+    def title_scores(self):
+        """Likes and dislikes per title across all sessions (indexed by title), as of the last refresh."""
+        return self._aggregates[0]
+
+    def precision(self):
+        """Liked / (liked + not interested) over every session, or None without feedback."""
+        return self._aggregates[1]
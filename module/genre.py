@@ -0,0 +1,64 @@
+import re
+
+import pandas as pd
+
+from module.hybrid import HybridRanker
+
+
+class GenreRecommender:
+    def __init__(self, movies_file, ratings_file, ranker=None):
+        # Load data (or reuse a ranker already built from the same files)
+        # ---------- ⭐ Shared ranker: same Bayesian formula as the rating module ----------
+        # Adds year, clean title and per-movie stats: votes (v), plain average (avg), weighted score
+        if ranker is None:
+            ranker = HybridRanker(pd.read_csv(movies_file), pd.read_csv(ratings_file))
+        self.ranker = ranker
+        self.C, self.m = self.ranker.C, self.ranker.m
+        self.movies = self.ranker.table
+
+    def recommend(self, selected_genres, year_range, top_n=50):
+        # Filter by selected genres and year range
+        mask = self.ranker.year_mask(year_range)
+        if selected_genres:
+            mask &= self.ranker.genre_mask(selected_genres)
+
+        # (Optional) enforce vote floor like your module: pass min_votes=self.m
+
+        # ✅ CHANGED: rank by Bayesian score (fair ranking), but DISPLAY only avg later
+        df = self.ranker.rank("weighted_rating", k=top_n, mask=mask)
+
+        # Return only the columns your teammate wants to show (no score shown)
+        out = df[['clean_title', 'genres', 'year', 'avg']].copy()
+        out['avg'] = out['avg'].round(2)  # nice formatting
+        return out
+
+    def recommend_by_similarity(self, content, selected_genres, year_range, top_n=50):
+        """Rank by genre similarity (partial matches included), Bayesian score breaks ties"""
+        sims = content.genre_similarity(selected_genres)
+        rows = content.rows(self.movies['movieId'])
+        df = self.movies.assign(similarity=sims[rows])
+        df = df[(df['year'] >= year_range[0]) & (df['year'] <= year_range[1]) & (df['similarity'] > 0)]
+        df = df.sort_values(['similarity', 'score'], ascending=False)
+
+        out = df[['clean_title', 'genres', 'year', 'avg']].head(top_n).copy()
+        out['avg'] = out['avg'].round(2)
+        return out
+
+    def more_like_this(self, content, movie_id, top_n=10):
+        """Nearest movies by genre and decade from the precomputed neighbour table (works without ratings)"""
+        similar = content.similar(movie_id, n=top_n)
+        df = similar.merge(self.movies, on='movieId', how='left')
+        out = df[['clean_title', 'genres', 'year', 'similarity', 'avg']].copy()
+        out['similarity'] = out['similarity'].round(2)
+        out['avg'] = out['avg'].round(2)
+        return out
+
+
+def recommend_from_top_list(top, selected_genres, year_range, top_n=50):
+    """Degraded GenreRecommender.recommend over the precomputed top list (used while warming up)"""
+    df = top[(top['year'] >= year_range[0]) & (top['year'] <= year_range[1])]
+    if selected_genres:
+        df = df[df['genres'].str.contains('|'.join(map(re.escape, selected_genres)), na=False)]
+    out = df[['clean_title', 'genres', 'year', 'avg']].head(top_n).copy()
+    out['avg'] = out['avg'].round(2)
+    return out
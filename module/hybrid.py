@@ -0,0 +1,130 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from module.shared import frame_from_arrays, frame_to_arrays
+
+# Named signals in column order; genre bits follow as "genre:<name>"
+SIGNALS = ["votes", "mean", "bayes", "popularity", "recency"]
+
+# Each page's ranking expressed as weights over the feature matrix
+PRESETS = {
+    "most_rated": {"votes": 1.0},          # app.py "Most-Selling"
+    "highest_mean": {"mean": 1.0},         # app.py "Highest-Rated" / "by Genre"
+    "weighted_rating": {"bayes": 1.0},     # ratingMovie.py, moviesGenres.py
+    "popularity": {"popularity": 1.0},     # popularity column when the catalog has one
+    "hybrid": {"bayes": 0.6, "popularity": 0.25, "recency": 0.15},
+}
+
+
+class HybridRanker:
+    def __init__(self, movies, ratings, min_votes_quantile=0.80):
+        """One dense float32 feature matrix per movie, ranked by weight vectors.
+
+        Columns are votes, mean, Bayesian (IMDb-style) score, popularity,
+        recency and one bit per genre, each min-max scaled to [0, 1] so any
+        blend is a single matrix-vector product. Movies without ratings have
+        NaN mean/score and rank after every rated movie.
+        """
+        stats = (
+            ratings.groupby("movieId")
+                   .agg(v=("rating", "count"), avg=("rating", "mean"))
+                   .reset_index()
+        )
+        # Global mean C and vote threshold m (quantile over rated movies, rounded up)
+        self.C = float(ratings["rating"].mean())
+        self.m = int(math.ceil(float(stats["v"].quantile(min_votes_quantile))))
+        stats["score"] = (stats["v"] / (stats["v"] + self.m)) * stats["avg"] + (self.m / (stats["v"] + self.m)) * self.C
+
+        table = movies.merge(stats, on="movieId", how="left")
+        table["v"] = table["v"].fillna(0).astype(int)
+        if "year" not in table:
+            table["year"] = pd.to_numeric(table["title"].str.extract(r"\((\d{4})\)")[0], errors="coerce")
+        if "clean_title" not in table:
+            table["clean_title"] = table["title"].str.replace(r"\s*\(\d{4}\)", "", regex=True)
+        self.table = table
+
+        # Genre bits
+        tags = table["genres"].fillna("").str.split("|")
+        self.genres = sorted({g for gs in tags for g in gs if g})
+        genre_bits = np.zeros((len(table), len(self.genres)), dtype=np.float32)
+        col = {g: j for j, g in enumerate(self.genres)}
+        for i, gs in enumerate(tags):
+            for g in gs:
+                if g in col:
+                    genre_bits[i, col[g]] = 1.0
+
+        popularity = table["popularity"] if "popularity" in table else np.log1p(table["v"])
+        raw = np.column_stack([
+            table["v"].to_numpy(dtype=np.float32),
+            table["avg"].to_numpy(dtype=np.float32),
+            table["score"].to_numpy(dtype=np.float32),
+            np.asarray(popularity, dtype=np.float32),
+            table["year"].to_numpy(dtype=np.float32),
+        ])
+        self.columns = SIGNALS + [f"genre:{g}" for g in self.genres]
+        self.features = np.hstack([self._min_max(raw), genre_bits])
+
+    def shared_state(self):
+        """Arrays and scalars to publish on the shared data plane."""
+        arrays, table_columns = frame_to_arrays(self.table, "ranker.table")
+        arrays["ranker.features"] = self.features
+        meta = {"C": self.C, "m": self.m, "genres": self.genres, "columns": self.columns, "table_columns": table_columns}
+        return arrays, meta
+
+    @classmethod
+    def from_shared(cls, arrays, meta):
+        """Attach to a published ranker (read-only, nothing recomputed)."""
+        self = cls.__new__(cls)
+        self.C, self.m = meta["C"], meta["m"]
+        self.genres, self.columns = meta["genres"], meta["columns"]
+        self.table = frame_from_arrays(arrays, "ranker.table", meta["table_columns"])
+        self.features = arrays["ranker.features"]
+        return self
+
+    @staticmethod
+    def _min_max(raw):
+        lo = np.nanmin(raw, axis=0)
+        span = np.nanmax(raw, axis=0) - lo
+        span[span == 0] = 1.0
+        return (raw - lo) / span
+
+    def weight_vector(self, weights):
+        """Turn a preset name or {column: weight} dict into a feature-aligned vector."""
+        if isinstance(weights, str):
+            weights = PRESETS[weights]
+        w = np.zeros(len(self.columns), dtype=np.float32)
+        for name, value in weights.items():
+            w[self.columns.index(name)] = value
+        return w
+
+    def genre_mask(self, genres):
+        """Movies tagged with any of the given genres."""
+        cols = [len(SIGNALS) + self.genres.index(g) for g in genres if g in self.genres]
+        return self.features[:, cols].any(axis=1)
+
+    def year_mask(self, year_range):
+        yr = self.table["year"].to_numpy(dtype=float)
+        return (yr >= year_range[0]) & (yr <= year_range[1])
+
+    def scores(self, weights):
+        """Blended score of every movie (NaN for missing signals)."""
+        w = self.weight_vector(weights)
+        used = w != 0
+        # Only multiply the columns in use so unused NaN signals do not leak in
+        return self.features[:, used] @ w[used]
+
+    def rank(self, weights, k=10, mask=None, min_votes=0):
+        """Top-k rows of the movie table by blended score, best first."""
+        score = self.scores(weights)
+        key = np.where(np.isnan(score), np.inf, -score)  # missing scores sort last
+        valid = self.table["v"].to_numpy() >= min_votes
+        if mask is not None:
+            valid &= mask
+        candidates = np.flatnonzero(valid)
+        if k < len(candidates):
+            candidates = candidates[np.argpartition(key[candidates], k - 1)[:k]]
+        # Best first; ties keep catalog order
+        top = candidates[np.lexsort((candidates, key[candidates]))]
+        return self.table.iloc[top].assign(blend=score[top])
@@ -0,0 +1,46 @@
+import math
+
+import numpy as np
+import streamlit as st
+
+
+class PagedResult:
+    def __init__(self, df, sort_keys=None, seed=None):
+        """Wrap a result set and precompute every display order once.
+
+        sort_keys maps an option label to (column, ascending). A "Random"
+        permutation is always available and stays fixed for this result set.
+        """
+        self.df = df.reset_index(drop=True)
+        self.orders = {None: np.arange(len(self.df))}
+        for label, (column, ascending) in (sort_keys or {}).items():
+            self.orders[label] = (
+                self.df[column]
+                .sort_values(ascending=ascending, kind="stable", na_position="last")
+                .index.to_numpy()
+            )
+        self.orders["Random"] = np.random.default_rng(seed).permutation(len(self.df))
+
+    def __len__(self):
+        return len(self.df)
+
+    def n_pages(self, page_size):
+        return max(1, math.ceil(len(self.df) / page_size))
+
+    def page(self, order=None, page=0, page_size=50):
+        """Return one page of rows in the requested order (0-based page)."""
+        start = page * page_size
+        return self.df.iloc[self.orders[order][start:start + page_size]]
+
+
+def page_picker(result, key, page_size=50):
+    """Render a page number input when needed and return the 0-based page."""
+    n_pages = result.n_pages(page_size)
+    page_key = f"{key}_page"
+    # Clamp a remembered page if the result set shrank since the last rerun
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = n_pages
+    if n_pages == 1:
+        return 0
+    page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, step=1, key=page_key)
+    return int(page) - 1
@@ -0,0 +1,64 @@
+import pandas as pd
+
+from module.shared import frame_from_arrays, frame_to_arrays
+from module.title_index import TitleIndex
+
+
+class PopularityRecommender:
+    def __init__(self, movies_file):
+        # Load dataset
+        self.movies = pd.read_csv(movies_file)
+
+        # Check required columns
+        if "title" not in self.movies.columns or "popularity" not in self.movies.columns:
+            raise ValueError("CSV must contain 'title' and 'popularity' columns.")
+
+        # Clean dataset
+        self.movies = self.movies[['title', 'popularity']].dropna()
+        self.movies = self.movies[self.movies['popularity'] > 0].reset_index(drop=True)
+
+        # Sorted title index for type-ahead search and O(log n) title -> row lookups
+        self.title_index = TitleIndex(self.movies['title'])
+
+    def shared_state(self):
+        """Arrays and scalars to publish on the shared data plane."""
+        arrays, columns = frame_to_arrays(self.movies, "popularity.movies")
+        arrays.update(self.title_index.shared_state("popularity.titles"))
+        return arrays, {"columns": columns}
+
+    @classmethod
+    def from_shared(cls, arrays, meta):
+        """Attach to the published catalog and title index (nothing re-read or re-sorted)."""
+        self = cls.__new__(cls)
+        self.movies = frame_from_arrays(arrays, "popularity.movies", meta["columns"])
+        self.title_index = TitleIndex.from_shared(arrays, "popularity.titles", self.movies['title'])
+        return self
+
+    def find_movie(self, title):
+        """Return the row for an exact title, or None if it is not in the catalog"""
+        row_id = self.title_index.lookup(title)
+        return None if row_id is None else self.movies.iloc[row_id]
+
+    def search_titles(self, prefix, limit=20):
+        """Type-ahead search over the whole catalog by title prefix"""
+        return self.movies.iloc[self.title_index.search(prefix, limit)]
+
+    def recommend_by_popularity(self, popularity, locked_range=None):
+        """Recommend movies within ±15% popularity range"""
+        if not locked_range:
+            lower = popularity * 0.85
+            upper = popularity * 1.15
+        else:
+            lower, upper = locked_range
+
+        candidates = self.movies[
+            (self.movies['popularity'] >= lower) & (self.movies['popularity'] <= upper)
+        ]
+        return candidates[['title', 'popularity']], (lower, upper)
+
+    def rerank(self, candidates, feedback, n=10):
+        """Sample n candidates weighted by their smoothed like rate across all sessions"""
+        likes = candidates['title'].map(feedback['likes']).fillna(0)
+        dislikes = candidates['title'].map(feedback['dislikes']).fillna(0)
+        weights = (likes + 1) / (likes + dislikes + 2)  # unseen titles weigh 0.5
+        return candidates.sample(min(n, len(candidates)), weights=weights)
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+QUANTILES = np.round(np.arange(0.50, 0.951, 0.01), 2)  # every ratingMovie.py slider step
+
+
+class QuantileSweep:
+    def __init__(self, ranker, quantiles):
+        """Weighted ratings for every vote-quantile setting in one vectorized pass.
+
+        Row i of `scores` holds the IMDb-style WeightedRating of every movie
+        when m = ceil(quantile(v, quantiles[i])), so moving the slider is a
+        row lookup instead of a fresh groupby/merge/sort. Per-movie stats come
+        from the shared HybridRanker, so m, C and the formula match its
+        "weighted_rating" preset.
+        """
+        self.table = self._rated_table(ranker)
+        self.C = ranker.C
+        self.quantiles = np.round(np.asarray(quantiles, dtype=float), 4)
+        self.m = np.ceil(np.quantile(self.table["v"].to_numpy(), self.quantiles)).astype(int)
+
+        # (n_quantiles, n_movies) score matrix plus the v >= m eligibility mask
+        v = self.table["v"].to_numpy(dtype=float)[None, :]
+        R = self.table["R"].to_numpy(dtype=float)[None, :]
+        m = self.m[:, None].astype(float)
+        self.scores = (v / (v + m)) * R + (m / (v + m)) * self.C
+        self.eligible = v >= m
+
+        # Best-first order per quantile; ineligible movies sink to the end
+        self.order = np.argsort(np.where(self.eligible, -self.scores, np.inf), axis=1, kind="stable")
+
+    @staticmethod
+    def _rated_table(ranker):
+        # Movie attributes aligned with the score columns (rated movies only)
+        return ranker.table[ranker.table["v"] > 0].rename(columns={"avg": "R"}).reset_index(drop=True)
+
+    def shared_state(self):
+        """Arrays to publish on the shared data plane."""
+        return {f"sweep.{name}": getattr(self, name) for name in ("quantiles", "m", "scores", "eligible", "order")}, {}
+
+    @classmethod
+    def from_shared(cls, arrays, meta, ranker):
+        """Attach to a published sweep of the given ranker (read-only, nothing recomputed)."""
+        self = cls.__new__(cls)
+        for name in ("quantiles", "m", "scores", "eligible", "order"):
+            setattr(self, name, arrays[f"sweep.{name}"])
+        self.table = self._rated_table(ranker)
+        self.C = ranker.C
+        return self
+
+    def index_of(self, quantile):
+        """Row of the sweep for a slider value (nearest computed quantile)."""
+        return int(np.abs(self.quantiles - quantile).argmin())
+
+    def _mask(self, genre_filter=None, year_range=None):
+        mask = np.ones(len(self.table), dtype=bool)
+        if genre_filter and genre_filter.lower() != "all":
+            mask &= self.table["genres"].str.contains(genre_filter, case=False, na=False).to_numpy()
+        if year_range:
+            y0, y1 = year_range
+            yr = pd.to_numeric(self.table["year"], errors="coerce").to_numpy()
+            mask &= (yr >= y0) & (yr <= y1)
+        return mask
+
+    def weighted_table(self, quantile, genre_filter=None, year_range=None):
+        """Same result as compute_weighted_table, served from the precomputed sweep."""
+        i = self.index_of(quantile)
+        order = self.order[i]
+        keep = (self.eligible[i] & self._mask(genre_filter, year_range))[order]
+        rows = order[keep]
+        table = self.table.iloc[rows].assign(WeightedRating=self.scores[i, rows])
+        return table, self.C, int(self.m[i])
+
+    def ranks(self, genre_filter=None, year_range=None):
+        """(n_quantiles, n_movies) rank of each movie per setting (NaN when filtered out)."""
+        keep = np.take_along_axis(self.eligible & self._mask(genre_filter, year_range), self.order, axis=1)
+        ranks_sorted = np.where(keep, np.cumsum(keep, axis=1), np.nan)
+        ranks = np.empty_like(ranks_sorted)
+        np.put_along_axis(ranks, self.order, ranks_sorted, axis=1)
+        return ranks
+
+    def sweep_frame(self, n=10, genre_filter=None, year_range=None):
+        """Long table of the top-n for every quantile (quantile, m, rank, movie, score)."""
+        ranks = self.ranks(genre_filter, year_range)
+        q_idx, rows = np.nonzero(ranks <= n)
+        out = pd.DataFrame({
+            "quantile": self.quantiles[q_idx],
+            "m": self.m[q_idx],
+            "rank": ranks[q_idx, rows].astype(int),
+            "movieId": self.table["movieId"].to_numpy()[rows],
+            "clean_title": self.table["clean_title"].to_numpy()[rows],
+            "WeightedRating": self.scores[q_idx, rows],
+        })
+        return out.sort_values(["quantile", "rank"]).reset_index(drop=True)
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def source_key(paths):
+    """Short hash of the source files' size and mtime; a data refresh gets a new key.
+
+    None while a source is missing (e.g. being replaced), so callers neither attach nor publish.
+    """
+    h = hashlib.sha1()
+    for p in paths:
+        try:
+            st = os.stat(p)
+        except OSError:
+            return None
+        h.update(f"{os.path.abspath(p)}:{st.st_size}:{st.st_mtime_ns};".encode())
+    return h.hexdigest()[:16]
+
+
+def frame_to_arrays(df, prefix):
+    """Columns as numpy arrays (text as fixed-width unicode, which can be memory-mapped)."""
+    arrays = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if values.dtype == object or pd.api.types.is_string_dtype(df[col]):
+            values = df[col].fillna("").to_numpy(dtype=str)
+        arrays[f"{prefix}.{col}"] = values
+    return arrays, list(df.columns)
+
+
+def frame_from_arrays(arrays, prefix, columns):
+    # copy=False keeps numeric columns as views of the mapped files
+    return pd.DataFrame({col: arrays[f"{prefix}.{col}"] for col in columns}, copy=False)
+
+
+class SharedArrays:
+    def __init__(self, root):
+        """Host-wide, read-only data plane of memory-mapped .npy files.
+
+        One directory per key holds the arrays plus a meta.json of scalars.
+        The first process to build a version publishes it; every other
+        process attaches with np.load(mmap_mode="r"), so all of them share
+        the same OS page-cache pages instead of private copies.
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _dir(self, key):
+        return os.path.join(self.root, key)
+
+    def attach(self, key):
+        """(arrays, meta) for a published key, or None if nobody has published it yet."""
+        path = self._dir(key)
+        if not os.path.isdir(path):
+            return None
+        try:
+            with open(os.path.join(path, "meta.json")) as f:
+                meta = json.load(f)
+            arrays = {
+                name[:-len(".npy")]: np.load(os.path.join(path, name), mmap_mode="r")
+                for name in os.listdir(path) if name.endswith(".npy")
+            }
+        except FileNotFoundError:
+            # Pruned between the check and the load
+            return None
+        return arrays, meta
+
+    def publish(self, key, arrays, meta, current=True):
+        """Write a version once and attach to it (another process may have won the race).
+
+        Older versions are pruned only if key is still current, so a slow
+        build of old data never deletes a newer version published meanwhile.
+        """
+        if not os.path.isdir(self._dir(key)):
+            tmp = tempfile.mkdtemp(dir=self.root, prefix=f".{key}-")
+            for name, values in arrays.items():
+                np.save(os.path.join(tmp, f"{name}.npy"), np.ascontiguousarray(values))
+            with open(os.path.join(tmp, "meta.json"), "w") as f:
+                json.dump(meta, f)
+            try:
+                # Directory rename is atomic: readers see all files or none
+                os.rename(tmp, self._dir(key))
+            except OSError:
+                shutil.rmtree(tmp, ignore_errors=True)
+        if current:
+            self.prune(keep=key)
+        return self.attach(key)
+
+    def prune(self, keep, stale_after=3600):
+        """Remove other versions, and temp dirs left by writers that died mid-publish.
+
+        Processes still mapping a removed version keep their pages until they exit.
+        """
+        now = time.time()
+        for name in os.listdir(self.root):
+            path = self._dir(name)
+            if name.startswith("."):
+                # A temp dir may belong to a publish in progress; only drop old ones
+                try:
+                    abandoned = now - os.path.getmtime(path) > stale_after
+                except OSError:
+                    continue
+                if abandoned:
+                    shutil.rmtree(path, ignore_errors=True)
+            elif name != keep:
+                shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,60 @@
+import re
+
+import numpy as np
+
+
+def normalize_title(title):
+    """Lower-case and collapse whitespace so lookups ignore case and spacing."""
+    return re.sub(r"\s+", " ", str(title)).strip().casefold()
+
+
+class TitleIndex:
+    def __init__(self, titles):
+        # Keep the original titles so exact matches win over case-only matches
+        self.titles = np.asarray(titles, dtype=object)
+
+        # Sort normalized keys once; row_ids maps each sorted key back to its row.
+        # Keys are a fixed-width string array so they can be memory-mapped.
+        keys = np.array([normalize_title(t) for t in self.titles], dtype=str)
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.row_ids = order
+
+    def shared_state(self, prefix):
+        """Sorted keys and row ids to publish on the shared data plane."""
+        return {f"{prefix}.keys": self.keys, f"{prefix}.row_ids": self.row_ids}
+
+    @classmethod
+    def from_shared(cls, arrays, prefix, titles):
+        """Attach to published keys (read-only, nothing re-sorted)."""
+        self = cls.__new__(cls)
+        self.titles = np.asarray(titles, dtype=object)
+        self.keys = arrays[f"{prefix}.keys"]
+        self.row_ids = arrays[f"{prefix}.row_ids"]
+        return self
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, title):
+        """Resolve a title to its row id with binary search (None if missing)."""
+        key = normalize_title(title)
+        lo = int(np.searchsorted(self.keys, key))
+        first = None
+        while lo < len(self.keys) and self.keys[lo] == key:
+            row = int(self.row_ids[lo])
+            if self.titles[row] == title:
+                return row
+            if first is None:
+                first = row
+            lo += 1
+        return first
+
+    def search(self, prefix, limit=20):
+        """Return row ids of titles starting with prefix, in alphabetical order."""
+        key = normalize_title(prefix)
+        if not key:
+            return []
+        lo = int(np.searchsorted(self.keys, key))
+        hi = int(np.searchsorted(self.keys, key + chr(0x10FFFF)))
+        return self.row_ids[lo:min(hi, lo + limit)].tolist()
@@ -0,0 +1,401 @@
+import logging
+import mmap
+import os
+import sys
+import tempfile
+import threading
+import time
+import weakref
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from module.content import ContentRecommender
+from module.genre import GenreRecommender
+from module.hybrid import HybridRanker
+from module.popular import PopularityRecommender
+from module.rating import QUANTILES, QuantileSweep
+from module.shared import SharedArrays, frame_from_arrays, frame_to_arrays, source_key
+
+logger = logging.getLogger(__name__)
+
+MOVIES_PATH = "dataset/movies.csv"
+RATINGS_PATH = "dataset/ratings.csv"
+TOP_LIST_PATH = "dataset/warm_top.pkl"
+NEIGHBOURS_PATH = "dataset/content_neighbours.npz"
+SHARED_DIR = "dataset/shared/movielens"
+POPULARITY_PATH = "dataset/RevenueMovies.csv"
+POPULARITY_SHARED_DIR = "dataset/shared/popularity"
+
+
+class WarmupScheduler:
+    def __init__(self, top_list_path=None, version=1, on_finished=None):
+        """Build engines one after another on a background thread.
+
+        Pages ask for an artifact with get() and fall back to the top list
+        saved by the previous build until it is ready. Finished artifacts are
+        published by swapping in a new dict, so a reader sees an artifact
+        either fully built or not at all. One finished scheduler is one
+        immutable snapshot version (see SnapshotManager).
+        """
+        self.version = version
+        self.on_finished = on_finished
+        self._tasks = []
+        self._artifacts = {}
+        self._done = threading.Condition()
+        self.current = None
+        self.finished = False
+        self.error = None
+        self.timings = {}
+        self.fallback = load_top_list(top_list_path)
+
+    def add(self, name, build):
+        """Register a build step; build(artifacts) receives everything built before it."""
+        self._tasks.append((name, build))
+        return self
+
+    def start(self):
+        threading.Thread(target=self._run, name="warmup", daemon=True).start()
+        return self
+
+    def _run(self):
+        for name, build in self._tasks:
+            self.current = name
+            start = time.perf_counter()
+            try:
+                artifact = build(self._artifacts)
+            except Exception as exc:
+                logger.exception("Warm-up step %r failed", name)
+                self.error = f"{name}: {exc}"
+                break
+            self.timings[name] = time.perf_counter() - start
+            with self._done:
+                self._artifacts = {**self._artifacts, name: artifact}
+                self._done.notify_all()
+        with self._done:
+            self.current = None
+            self.finished = True
+            self._done.notify_all()
+        if self.on_finished is not None:
+            self.on_finished(self)
+
+    def get(self, name):
+        """The artifact if it is built, else None (never blocks)."""
+        return self._artifacts.get(name)
+
+    def wait(self, name, timeout=None):
+        """Block until the artifact is built (None if the warm-up failed or timed out)."""
+        with self._done:
+            self._done.wait_for(lambda: name in self._artifacts or self.finished, timeout)
+        return self._artifacts.get(name)
+
+    def progress(self):
+        """(finished steps, total steps, step in progress)."""
+        return len(self._artifacts), len(self._tasks), self.current
+
+    def nbytes(self):
+        """Approximate bytes held by the artifacts: private to this process vs memory-mapped."""
+        totals = {"private": 0, "shared": 0}
+        _nbytes(self._artifacts, set(), totals)
+        return totals
+
+
+def _is_mapped(arr):
+    while arr is not None:
+        if isinstance(arr, (np.memmap, mmap.mmap)):
+            return True
+        arr = getattr(arr, "base", None)
+    return False
+
+
+def _nbytes(obj, seen, totals):
+    if id(obj) in seen:
+        return
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        totals["shared" if _is_mapped(obj) else "private"] += obj.nbytes
+    elif isinstance(obj, pd.DataFrame):
+        totals["private"] += int(obj.index.memory_usage(deep=True))
+        for col in obj.columns:
+            _nbytes(obj[col], seen, totals)
+    elif isinstance(obj, pd.Series):
+        if pd.api.types.is_numeric_dtype(obj) or pd.api.types.is_bool_dtype(obj):
+            _nbytes(obj.to_numpy(), seen, totals)
+        else:
+            totals["private"] += int(obj.memory_usage(deep=True, index=False))
+    elif isinstance(obj, pd.Index):
+        totals["private"] += int(obj.memory_usage(deep=True))
+    elif isinstance(obj, dict):
+        totals["private"] += sys.getsizeof(obj)
+        for v in obj.values():
+            _nbytes(v, seen, totals)
+    elif isinstance(obj, (list, tuple, set)):
+        totals["private"] += sys.getsizeof(obj)
+        for v in obj:
+            _nbytes(v, seen, totals)
+    elif hasattr(obj, "__dict__"):
+        _nbytes(vars(obj), seen, totals)
+    else:
+        totals["private"] += sys.getsizeof(obj)
+
+
+class SnapshotManager:
+    def __init__(self, build_version, sources, check_interval=5.0):
+        """Versioned, immutable engine snapshots with atomic hot-swap.
+
+        build_version(version) returns an unstarted WarmupScheduler. When a
+        source file changes, the next version builds in the background while
+        readers keep the live one; on success the live pointer is swapped in
+        one assignment. The manager then drops its reference to the old
+        version, which is freed once the script runs still using it finish.
+        """
+        self._build_version = build_version
+        self.sources = sources
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._live = None
+        self._building = None
+        self._retired = []  # (version, weakref) of swapped-out versions
+        self._signature = None
+        self._last_check = 0.0
+        self._next_version = 1
+        self.reports = []
+        self.refresh()
+
+    def _source_signature(self):
+        return tuple((os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in self.sources)
+
+    def refresh(self, force=False):
+        """Start building a new version if the sources changed; True if a build started."""
+        with self._lock:
+            self._last_check = time.monotonic()
+            if self._building is not None:
+                return False
+            try:
+                signature = self._source_signature()
+            except OSError as exc:
+                # A source is briefly missing (rm + cp, non-atomic upload): keep serving
+                # the live version and look again at the next check
+                if self._live is not None:
+                    logger.warning("Source unavailable, keeping version %s: %s", self._live.version, exc)
+                    return False
+                # Nothing to serve yet: build anyway so the missing file becomes a failed version
+                signature = None
+            if signature is not None and signature == self._signature and not force:
+                return False
+            self._signature = signature
+            building = self._build_version(self._next_version)
+            building.on_finished = self._publish
+            self._building = building
+            self._next_version += 1
+        building.start()
+        return True
+
+    def _publish(self, snapshot):
+        memory = snapshot.nbytes()
+        report = {
+            "version": snapshot.version,
+            "build_s": round(sum(snapshot.timings.values()), 2),
+            "private_mb": round(memory["private"] / 2**20, 1),
+            "shared_mb": round(memory["shared"] / 2**20, 1),
+            "error": snapshot.error,
+        }
+        with self._lock:
+            self.reports.append(report)
+            # A failed rebuild keeps serving the live version
+            if snapshot.error and self._live is not None:
+                self._building = None
+                return
+            # Set the live pointer before clearing _building: current() reads them
+            # in the opposite order without the lock, so it always sees one of them
+            old, self._live = self._live, snapshot
+            self._building = None
+            if old is not None:
+                self._retired.append((old.version, weakref.ref(old)))
+        # This process just published its private build: swap to the mapped copy
+        if snapshot.get("shared") == "published":
+            self.refresh(force=True)
+
+    def current(self):
+        """Version for this script run: the live one, or the first build while it runs."""
+        if time.monotonic() - self._last_check > self.check_interval:
+            self.refresh()
+        building = self._building
+        live = self._live
+        return live if live is not None else building
+
+    def report(self):
+        """Build time, memory and status of every version."""
+        live, building = self._live, self._building
+        draining = {v for v, ref in self._retired if ref() is not None}
+        rows = []
+        for r in self.reports:
+            if live is not None and r["version"] == live.version:
+                status = "live"
+            elif r["version"] in draining:
+                status = "draining"
+            else:
+                status = "failed" if r["error"] else "released"
+            rows.append({**r, "status": status})
+        if building is not None:
+            done, total, current = building.progress()
+            rows.append({"version": building.version, "status": f"building {done}/{total} ({current})"})
+        return pd.DataFrame(rows)
+
+
+def load_dataset(movies_file, ratings_file):
+    """Read the CSVs and add year / clean title columns (vectorized)."""
+    movies = pd.read_csv(movies_file)
+    ratings = pd.read_csv(ratings_file)
+    if "year" not in movies:
+        movies["year"] = pd.to_numeric(movies["title"].str.extract(r"\((\d{4})\)")[0], errors="coerce")
+    if "clean_title" not in movies:
+        movies["clean_title"] = movies["title"].str.replace(r"\s*\(\d{4}\)", "", regex=True)
+    return movies, ratings
+
+
+def save_top_list(ranker, path, n=1000):
+    """Persist the all-time weighted-rating top list served while the next start warms up."""
+    top = ranker.rank("weighted_rating", k=n).drop(columns="blend").reset_index(drop=True)
+    top.attrs["global_mean_C"] = ranker.C
+    top.attrs["min_votes_m"] = ranker.m
+    # Write to a temp file and rename, so a process starting meanwhile never reads a partial pickle
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp.pkl")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            top.to_pickle(f)
+        os.replace(tmp, path)
+    except OSError:
+        logger.exception("Could not write top list %s", path)
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return top
+
+
+def load_top_list(path):
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        return pd.read_pickle(path)
+    except Exception:
+        logger.exception("Ignoring unreadable top list %s", path)
+        return None
+
+
+def publish_version(plane, key, sources, artifacts):
+    """Put every derived array of a freshly built version on the shared data plane.
+
+    Older versions are only pruned if the sources still hash to key (the
+    data did not change again while this version was building).
+    """
+    movies, ratings = artifacts["dataset"]
+    arrays, meta = {}, {}
+    for name in ("ranker", "sweep", "content"):
+        part_arrays, meta[name] = artifacts[name].shared_state()
+        arrays.update(part_arrays)
+    ratings_arrays, meta["ratings_columns"] = frame_to_arrays(ratings, "dataset.ratings")
+    arrays.update(ratings_arrays)
+    meta["movies_columns"] = list(movies.columns)
+    if key is None:
+        return None  # sources were missing when the build started; the next refresh publishes
+    plane.publish(key, arrays, meta, current=source_key(sources) == key)
+    return "published"
+
+
+def build_version(version):
+    """Build steps for one snapshot of every engine (returned unstarted).
+
+    If another process already published this data on the shared plane, the
+    steps only attach to it; otherwise they build and then publish.
+    """
+    plane = SharedArrays(SHARED_DIR)
+    sources = [MOVIES_PATH, RATINGS_PATH]
+    key = source_key(sources)
+    published = plane.attach(key) if key is not None else None
+    if published is not None:
+        arrays, meta = published
+        return (
+            WarmupScheduler(TOP_LIST_PATH, version=version)
+            .add("ranker", lambda a: HybridRanker.from_shared(arrays, meta["ranker"]))
+            .add("dataset", lambda a: (
+                a["ranker"].table[meta["movies_columns"]],
+                frame_from_arrays(arrays, "dataset.ratings", meta["ratings_columns"]),
+            ))
+            .add("sweep", lambda a: QuantileSweep.from_shared(arrays, meta["sweep"], a["ranker"]))
+            .add("genre", lambda a: GenreRecommender(MOVIES_PATH, RATINGS_PATH, ranker=a["ranker"]))
+            .add("content", lambda a: ContentRecommender.from_shared(arrays, meta["content"]))
+        )
+    return (
+        WarmupScheduler(TOP_LIST_PATH, version=version)
+        .add("dataset", lambda a: load_dataset(MOVIES_PATH, RATINGS_PATH))
+        .add("ranker", lambda a: HybridRanker(*a["dataset"]))
+        .add("top_list", lambda a: save_top_list(a["ranker"], TOP_LIST_PATH))
+        .add("sweep", lambda a: QuantileSweep(a["ranker"], QUANTILES))
+        .add("genre", lambda a: GenreRecommender(MOVIES_PATH, RATINGS_PATH, ranker=a["ranker"]))
+        .add("content", lambda a: ContentRecommender(a["dataset"][0], cache_path=NEIGHBOURS_PATH))
+        .add("shared", lambda a: publish_version(plane, key, sources, a))
+    )
+
+
+def publish_popularity(plane, key, sources, recommender):
+    """Put the popularity catalog and its title index on the shared data plane."""
+    if key is None:
+        return None
+    arrays, meta = recommender.shared_state()
+    plane.publish(key, arrays, meta, current=source_key(sources) == key)
+    return "published"
+
+
+def build_popularity_version(version):
+    """Build steps for one snapshot of the popularity explorer's catalog (returned unstarted).
+
+    Kept apart from build_version: RevenueMovies.csv is a separate source,
+    and a missing or broken file must not fail the MovieLens engines.
+    """
+    plane = SharedArrays(POPULARITY_SHARED_DIR)
+    sources = [POPULARITY_PATH]
+    key = source_key(sources)
+    published = plane.attach(key) if key is not None else None
+    if published is not None:
+        arrays, meta = published
+        return WarmupScheduler(version=version).add(
+            "popularity", lambda a: PopularityRecommender.from_shared(arrays, meta)
+        )
+    return (
+        WarmupScheduler(version=version)
+        .add("popularity", lambda a: PopularityRecommender(POPULARITY_PATH))
+        .add("shared", lambda a: publish_popularity(plane, key, sources, a["popularity"]))
+    )
+
+
+@st.cache_resource
+def get_snapshots():
+    """Engine versions for this server process; a new one builds when the CSVs change."""
+    return SnapshotManager(build_version, [MOVIES_PATH, RATINGS_PATH])
+
+
+def get_warmup():
+    """Engines for this script run. Read every artifact from the one returned object
+    so a hot-swap mid-run cannot mix two versions."""
+    return get_snapshots().current()
+
+
+@st.cache_resource
+def get_popularity_snapshots():
+    """Popularity catalog versions for this server process; a new one builds when the CSV changes."""
+    return SnapshotManager(build_popularity_version, [POPULARITY_PATH])
+
+
+def get_popularity_warmup():
+    """Popularity catalog for this script run (see get_warmup)."""
+    return get_popularity_snapshots().current()
+
+
+def show_progress(warmup):
+    """Progress bar while the engines build (or a warning if a step failed)."""
+    done, total, current = warmup.progress()
+    if warmup.error:
+        st.warning(f"⚠️ Some recommender data could not be built ({warmup.error}).")
+    elif done < total:
+        st.progress(done / total, text=f"⏳ Warming up ({current or 'starting'})… showing the all-time top list meanwhile")
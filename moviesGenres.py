@@ -1,60 +1,18 @@
 import math  # ✅ CHANGED: needed for ceil if you want it, the fck
 import streamlit as st
-import pandas as pd
-import re
 import random
 
-class GenreRecommender:
-    def __init__(self, movies_file, ratings_file):
-        # Load data
-        self.movies = pd.read_csv(movies_file)
-        self.ratings = pd.read_csv(ratings_file)
+from module.genre import recommend_from_top_list
+from module.pagination import PagedResult, page_picker
+from module.warmup import get_warmup, show_progress
 
-        # Extract year from title
-        self.movies['year'] = self.movies['title'].apply(
-            lambda x: int(re.search(r'\((\d{4})\)', x).group(1)) if re.search(r'\((\d{4})\)', x) else None
-        )
-
-        # Create clean title (without year)
-        self.movies['clean_title'] = self.movies['title'].apply(
-            lambda x: re.sub(r'\s*\(\d{4}\)', '', x)
-        )
-
-        # ---------- ⭐ Use the same formula as your rating module ----------
-        # Per-movie stats: votes (v) and plain average (R -> avg)
-        stats = (self.ratings.groupby('movieId')
-                 .agg(v=('rating', 'count'), R=('rating', 'mean'))
-                 .reset_index())
-        stats = stats.rename(columns={'R': 'avg'})  # keep plain average for display
-
-        # Global mean C and vote threshold m (80th percentile like your module)
-        self.C = float(self.ratings['rating'].mean())
-        m_q = float(stats['v'].quantile(0.80))
-        self.m = int(m_q)  # or int(math.ceil(m_q)) if you prefer a ceiling
-
-        # IMDb-style weighted score for ranking ONLY
-        stats['score'] = (stats['v'] / (stats['v'] + self.m)) * stats['avg'] + (self.m / (stats['v'] + self.m)) * self.C
-
-        # Merge stats into movies dataframe (now movies has: avg, v, score)
-        self.movies = self.movies.merge(stats, on='movieId', how='left')
-
-    def recommend(self, selected_genres, year_range, top_n=50):
-        # Filter by selected genres and year range
-        df = self.movies.copy()
-        if selected_genres:
-            df = df[df['genres'].str.contains('|'.join(selected_genres), case=False, na=False)]
-        df = df[(df['year'] >= year_range[0]) & (df['year'] <= year_range[1])]
-
-        # (Optional) enforce vote floor like your module:
-        # df = df[df['v'] >= self.m]
-
-        # ✅ CHANGED: sort by Bayesian score (fair ranking), but DISPLAY only avg later
-        df = df.sort_values('score', ascending=False)
-
-        # Return only the columns your teammate wants to show (no score shown)
-        out = df[['clean_title', 'genres', 'year', 'avg']].head(top_n).copy()
-        out['avg'] = out['avg'].round(2)  # nice formatting
-        return out
+# Display orders precomputed once per result set (label -> column, ascending)
+SORT_OPTIONS = {
+    "Title (A-Z)": ("Movies Title", True),
+    "Year (Ascending)": ("Year", True),
+    "Year (Descending)": ("Year", False),
+}
+PAGE_SIZE = 50
 
 # ---------------- STREAMLIT APP ----------------
 st.markdown(
@@ -76,71 +34,111 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# Initialize recommender
-recommender = GenreRecommender("dataset/movies.csv", "dataset/ratings.csv")
+# Initialize recommender (built once per server in the background; top list until ready)
+warmup = get_warmup()
+recommender = warmup.get("genre")
+content_engine = warmup.get("content")
+if recommender is None and warmup.fallback is None:
+    # First start ever: nothing precomputed yet, so wait for the real engine
+    with st.spinner("Building movie indexes for the first time…"):
+        recommender = warmup.wait("genre")
+    if recommender is None:
+        st.error(f"Failed to build the recommender data ({warmup.error}).")
+        st.stop()
+show_progress(warmup)
+catalog = recommender.movies if recommender is not None else warmup.fallback
 
 # Initialize session state
 if "filtered_movies" not in st.session_state:
-    st.session_state["filtered_movies"] = pd.DataFrame()
+    st.session_state["filtered_movies"] = None
 
 # User input: genre selection
-all_genres = sorted(set(g for gs in recommender.movies['genres'].dropna().str.split('|') for g in gs))
+all_genres = sorted(set(g for gs in catalog['genres'].dropna().str.split('|') for g in gs))
 selected_genres = st.multiselect("🎭 Select genres:", all_genres, default=[])
 
 # User input: year range
-min_year, max_year = int(recommender.movies['year'].min()), int(recommender.movies['year'].max())
+min_year, max_year = int(catalog['year'].min()), int(catalog['year'].max())
 year_range = st.slider(
     "📅 Select year range:",
     min_value=min_year,
     max_value=max_year,
     value=(min_year, max_year)
 )
+rank_by_similarity = st.checkbox("🧭 Rank by genre similarity (include close matches)", disabled=content_engine is None)
 
 # ---------------- Show Recommendations ----------------
 if st.button("📌 Show Recommendations"):
-    if selected_genres:
+    if recommender is None:
+        filtered = recommend_from_top_list(catalog, selected_genres, year_range, top_n=500)
+    elif selected_genres and rank_by_similarity and content_engine is not None:
+        filtered = recommender.recommend_by_similarity(content_engine, selected_genres, year_range, top_n=500)
+    elif selected_genres:
         filtered = recommender.recommend(selected_genres, year_range, top_n=500)
     else:
         # no genres picked: still sort by score internally via recommend()
         filtered = recommender.recommend([], year_range, top_n=500)
 
-    st.session_state["filtered_movies"] = filtered
-
-# Display table if filtered data exists
-if not st.session_state["filtered_movies"].empty:
-    filtered_movies_display = st.session_state["filtered_movies"].copy()
-    filtered_movies_display['year'] = filtered_movies_display['year'].astype(int)
-    filtered_movies_display = filtered_movies_display[['clean_title', 'genres', 'year', 'avg']]  # ✅ CHANGED: show avg only
-    filtered_movies_display = filtered_movies_display.rename(columns={
+    # Prepare the display frame and all sort orders once per result set
+    filtered['year'] = filtered['year'].astype(int)
+    filtered = filtered[['clean_title', 'genres', 'year', 'avg']]  # ✅ CHANGED: show avg only
+    filtered = filtered.rename(columns={
         'clean_title': 'Movies Title',
         'genres': 'Genres',
         'year': 'Year',
         'avg': 'Average Rating'  # ✅ CHANGED: nicer label
     })
+    st.session_state["filtered_movies"] = PagedResult(filtered, SORT_OPTIONS)
+    st.session_state["filtered_range"] = year_range
+
+# Display table if filtered data exists
+result = st.session_state["filtered_movies"]
+if result is not None and len(result) > 0:
+    y0, y1 = st.session_state["filtered_range"]
 
     # Summary
-    st.info(f"Found {len(filtered_movies_display)} movies matching your selection ({year_range[0]}–{year_range[1]})")
+    st.info(f"Found {len(result)} movies matching your selection ({y0}–{y1})")
 
     # Sort dropdown (keep UI behavior; sorts *display* only)
     sort_option = st.selectbox(
         "🔃 Sort movies by:",
-        options=["Title (A-Z)", "Year (Ascending)", "Year (Descending)", "Random"]
+        options=list(SORT_OPTIONS) + ["Random"]
     )
-    if sort_option == "Title (A-Z)":
-        filtered_movies_display = filtered_movies_display.sort_values(by='Movies Title', ascending=True)
-    elif sort_option == "Year (Ascending)":
-        filtered_movies_display = filtered_movies_display.sort_values(by='Year', ascending=True)
-    elif sort_option == "Year (Descending)":
-        filtered_movies_display = filtered_movies_display.sort_values(by='Year', ascending=False)
-    elif sort_option == "Random":
-        filtered_movies_display = filtered_movies_display.sample(frac=1).reset_index(drop=True)
-
-    st.dataframe(filtered_movies_display, width=1200, height=800)
+    page = page_picker(result, "filtered_movies", PAGE_SIZE)
+
+    # Only the current page is materialized and sent to the browser
+    st.dataframe(result.page(sort_option, page, PAGE_SIZE), width=1200, height=800, hide_index=True)
+
+# ---------------- More Like This ----------------
+# Precomputed genre/decade neighbours, so titles with few or no ratings still get suggestions
+if recommender is not None and content_engine is not None:
+    st.subheader("🎞️ More Like This")
+    titles = recommender.movies.set_index('movieId')['title']
+    liked_id = st.selectbox(
+        "Pick a movie you enjoyed:",
+        options=titles.index,
+        index=None,
+        format_func=titles.get,
+        placeholder="Type to search a title…",
+    )
+    if liked_id is not None:
+        similar = recommender.more_like_this(content_engine, liked_id)
+        similar['year'] = similar['year'].astype('Int64')
+        st.dataframe(
+            similar.rename(columns={
+                'clean_title': 'Movies Title',
+                'genres': 'Genres',
+                'year': 'Year',
+                'similarity': 'Similarity',
+                'avg': 'Average Rating',
+            }),
+            width=1200,
+            hide_index=True,
+        )
 
 # ---------------- Surprise Me ----------------
 if st.button("🎲 Surprise Me With RANDOM Suggestion !"):
     # Build the same filtered pool
-    pool = recommender.movies.copy()
+    pool = catalog.copy()
     if selected_genres:
         pool = pool[pool['genres'].str.contains('|'.join(selected_genres), case=False, na=False)]
     pool = pool[(pool['year'] >= year_range[0]) & (pool['year'] <= year_range[1])]
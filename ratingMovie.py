@@ -1,32 +1,31 @@
 # movieRating.py
-import math, re #math for cell to round the vote threshold up, re -> regular expression (to pull the year out of movie title)
+import math #math for cell to round the vote threshold up
 import pandas as pd #to load the csv
 import streamlit as st
 
-MOVIES_PATH  = "dataset/movies.csv"
-RATINGS_PATH = "dataset/ratings.csv"
+from module.rating import QuantileSweep
+from module.warmup import get_warmup, show_progress
 
 # ------------------ Helpers ------------------
-@st.cache_data
-def load_data(movies_path: str, ratings_path: str):
-    #Load CSV into Data Frame
-    movies  = pd.read_csv(movies_path)
-    ratings = pd.read_csv(ratings_path)
-
-    #if the movies does not already have a year column, extract year from the title 
-    if "year" not in movies:
-        movies["year"] = movies["title"].apply(
-            lambda x: int(re.search(r"\((\d{4})\)", x).group(1)) if re.search(r"\((\d{4})\)", x) else None
-        )
-    if "clean_title" not in movies:
-        movies["clean_title"] = movies["title"].apply(lambda x: re.sub(r"\s*\(\d{4}\)", "", x))
-
+def page_options(movies: pd.DataFrame):
     #Build genre list using dropdown list
     genres = sorted({g for gs in movies["genres"].dropna().str.split("|") for g in gs if g != "(no genres listed)"})
     #Compute min/max year (slider)
     y_min, y_max = int(movies["year"].min()), int(movies["year"].max())
-    #return the data
-    return movies, ratings, ["All"] + genres, (y_min, y_max)
+    return ["All"] + genres, (y_min, y_max)
+
+def filter_table(
+    table: pd.DataFrame,
+    genre_filter: str | None = None,
+    year_range: tuple[int,int] | None = None,
+) -> pd.DataFrame:
+    if genre_filter and genre_filter.lower() != "all":
+        table = table[table["genres"].str.contains(genre_filter, case=False, na=False)]
+    if year_range:
+        y0, y1 = year_range
+        yr = table["year"].astype("Int64")
+        table = table[(yr.fillna(-1) >= y0) & (yr <= y1)]
+    return table
 
 def compute_weighted_table(
     ratings: pd.DataFrame,
@@ -46,17 +45,21 @@ def compute_weighted_table(
     m   = int(min_votes_abs) if min_votes_abs is not None else int(math.ceil(m_q))
     stats["WeightedRating"] = (stats["v"]/(stats["v"]+m))*stats["R"] + (m/(stats["v"]+m))*C
     table = stats.merge(movies, on="movieId", how="left")
-
-    if genre_filter and genre_filter.lower() != "all":
-        table = table[table["genres"].str.contains(genre_filter, case=False, na=False)]
-    if year_range:
-        y0, y1 = year_range
-        yr = table["year"].astype("Int64")
-        table = table[(yr.fillna(-1) >= y0) & (yr <= y1)]
+    table = filter_table(table, genre_filter, year_range)
 
     table = table.query("v >= @m").sort_values("WeightedRating", ascending=False).copy()
     return table, C, m
 
+def weighted_top_list(
+    top: pd.DataFrame,
+    genre_filter: str | None = None,
+    year_range: tuple[int,int] | None = None,
+):
+    #degraded answer while warming up: the saved all-time list at the default quantile
+    C, m = top.attrs["global_mean_C"], top.attrs["min_votes_m"]
+    table = top[top["v"] >= m].rename(columns={"avg":"R","score":"WeightedRating"})
+    return filter_table(table, genre_filter, year_range), C, m
+
 def get_top_rated(
     ratings: pd.DataFrame, movies: pd.DataFrame,
     n: int = 10,  # fixed Top-10
@@ -64,14 +67,22 @@ def get_top_rated(
     genre_filter: str | None = None,
     year_range: tuple[int,int] | None = None,
     min_votes_abs: int | None = None,
+    sweep: QuantileSweep | None = None,
+    top_list: pd.DataFrame | None = None,
 ) -> pd.DataFrame:
-    table, C, m = compute_weighted_table(
-        ratings, movies,
-        min_votes_quantile=min_votes_quantile,
-        genre_filter=genre_filter,
-        year_range=year_range,
-        min_votes_abs=min_votes_abs
-    )
+    if sweep is not None and min_votes_abs is None:
+        #slider settings are served from the precomputed sweep
+        table, C, m = sweep.weighted_table(min_votes_quantile, genre_filter, year_range)
+    elif top_list is not None:
+        table, C, m = weighted_top_list(top_list, genre_filter, year_range)
+    else:
+        table, C, m = compute_weighted_table(
+            ratings, movies,
+            min_votes_quantile=min_votes_quantile,
+            genre_filter=genre_filter,
+            year_range=year_range,
+            min_votes_abs=min_votes_abs
+        )
     out = (
         table[["clean_title","genres","year","v","R","WeightedRating","movieId"]]  # remove "title"
         .head(n)
@@ -106,7 +117,19 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-movies, ratings, GENRES, (YMIN, YMAX) = load_data(MOVIES_PATH, RATINGS_PATH)
+#Engines are built once per server in the background; serve the saved top list until ready
+warmup = get_warmup()
+sweep = warmup.get("sweep")
+if sweep is None and warmup.fallback is None:
+    with st.spinner("Building rating statistics for the first time…"):
+        sweep = warmup.wait("sweep")
+    if sweep is None:
+        st.error(f"Failed to build the recommender data ({warmup.error}).")
+        st.stop()
+show_progress(warmup)
+dataset = warmup.get("dataset")
+movies, ratings = dataset if dataset is not None else (warmup.fallback, None)
+GENRES, (YMIN, YMAX) = page_options(movies)
 
 quantile = st.slider("Min votes quantile (m from quantile)", 0.50, 0.95, 0.80, 0.01)
 genre = st.selectbox("Genre (optional)", GENRES)
@@ -118,6 +141,8 @@ top = get_top_rated(
     min_votes_quantile=quantile,
     genre_filter=None if genre == "All" else genre,
     year_range=yr,
+    sweep=sweep,
+    top_list=warmup.fallback,
 )
 
 st.caption(f"Global mean C = {top.attrs['global_mean_C']:.2f}  |  m = {int(top.attrs['min_votes_m'])} votes")
@@ -126,6 +151,21 @@ st.dataframe(
     use_container_width=True
 )
 
+# ------------------ Sensitivity to m ------------------
+if sweep is None:
+    st.caption("Quantile slider takes effect once the rating statistics finish building.")
+else:
+    with st.expander("📈 How the Top 10 shifts with the vote threshold m"):
+        shifts = sweep.sweep_frame(
+            n=10,
+            genre_filter=None if genre == "All" else genre,
+            year_range=yr,
+        )
+        st.line_chart(pd.DataFrame({"m": sweep.m}, index=sweep.quantiles))
+        # rank of the current Top 10 at every quantile (gaps = dropped out of the Top 10)
+        current = shifts[shifts["movieId"].isin(top["movieId"])]
+        st.line_chart(current.pivot_table(index="quantile", columns="clean_title", values="rank", aggfunc="min"))
+
 # ------------------ Evaluation (Precision@10) ------------------
 def precision_at_k(recs: pd.DataFrame, threshold: float = 4.0, k: int = 10) -> float:
     """Compute Precision@K: fraction of recommended movies with avg >= threshold."""